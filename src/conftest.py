@@ -0,0 +1,89 @@
+import glob
+import json
+import os
+import random
+import shutil
+import tempfile
+from statistics import fmean
+from typing import *
+import pytest
+
+# Environment variable naming this session's score directory, into which each
+# test process appends its pitsweeper scores as its own shard, so the averages
+# can still be reported when pytest-xdist spreads the tests across several
+# workers (each with its own copy of every module-level variable). Each shard
+# has a single writer, so no locking is needed
+SCORE_DIR_VAR = "PITSWEEPER_SCORE_DIR"
+
+# Time in seconds given to complete mazes of each difficulty mark; every maze
+# finishes in well under a second, so these only bound how long a regressed
+# agent can spin before failing. Set EASY_TIMEOUT / MED_TIMEOUT / HARD_TIMEOUT
+# in the environment to raise them for debugging (or when setting a TICK)
+DIFFICULTY_TIMEOUTS = {"easy": 3, "med": 10, "hard": 20}
+
+# Report order and labels of the score buckets logged by pitsweeper_tests
+SCORE_BUCKETS = [("easy", "Easy"), ("med", "Medium"), ("hard", "Hard"), ("custom", "Custom")]
+
+def _is_worker (config: pytest.Config) -> bool:
+    """
+    Returns whether this process is a pytest-xdist worker rather than the
+    controller (or a plain, non-distributed pytest run).
+    """
+    return hasattr(config, "workerinput")
+
+@pytest.fixture(autouse = True)
+def _seed_random () -> None:
+    """
+    Reseeds random before every test, so any randomness an agent uses plays out
+    the same way no matter which worker runs the test or in what order.
+    """
+    random.seed(0)
+
+@pytest.fixture(scope = "session")
+def score_dir () -> str:
+    """
+    Returns the directory this session's pitsweeper score shards are written to.
+    """
+    return os.environ[SCORE_DIR_VAR]
+
+def pytest_configure (config: pytest.Config) -> None:
+    # Runs on the controller before any workers are started, and workers inherit
+    # its environment, so every process of this session logs to the same fresh
+    # directory; concurrent sessions and stale shards from interrupted ones
+    # never mix into this session's averages
+    if not _is_worker(config):
+        os.environ[SCORE_DIR_VAR] = tempfile.mkdtemp(prefix = "pitsweeper_scores_")
+
+def pytest_collection_modifyitems (config: pytest.Config, items: list[pytest.Item]) -> None:
+    # Turns each difficulty mark into the timeout pytest-timeout enforces, so
+    # timeouts are decided at collection rather than when the module is imported
+    for item in items:
+        for (difficulty, default) in DIFFICULTY_TIMEOUTS.items():
+            if item.get_closest_marker(difficulty) is not None:
+                timeout = int(os.getenv(difficulty.upper() + "_TIMEOUT", str(default)))
+                item.add_marker(pytest.mark.timeout(timeout))
+
+def pytest_sessionfinish (session: pytest.Session, exitstatus: int) -> None:
+    """
+    Simple reporting hook that is called at the end of the unit tests to report
+    scores; used for grading only. Only the controller reports, after every
+    worker has finished writing its shard.
+    """
+    if _is_worker(session.config):
+        return
+
+    score_dir = os.environ[SCORE_DIR_VAR]
+    scores: dict[str, list[int]] = {bucket: [] for (bucket, _) in SCORE_BUCKETS}
+    for shard in glob.glob(os.path.join(score_dir, "*.jsonl")):
+        with open(shard) as f:
+            for line in f:
+                entry = json.loads(line)
+                scores[entry["bucket"]].append(entry["score"])
+    shutil.rmtree(score_dir, ignore_errors = True)
+
+    if any(len(bucket_scores) == 0 for bucket_scores in scores.values()):
+        return
+    print("\n---------------------------------------------")
+    print("[!] Tests completed:")
+    for (bucket, label) in SCORE_BUCKETS:
+        print("    > " + label + " Test Average:\t" + str(fmean(scores[bucket])))
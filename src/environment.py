@@ -1,10 +1,23 @@
 import os
-import re
 import sys
 import time
-import copy
 from constants import Constants
 from typing import *
+from functools import lru_cache
+
+# Maze tile constants bound once at module level for cheaper lookups in hot loops
+_WALL = Constants.WALL_BLOCK
+_GOAL = Constants.GOAL_BLOCK
+_PIT  = Constants.PIT_BLOCK
+_SAFE = Constants.SAFE_BLOCK
+_PLR  = Constants.PLR_BLOCK
+_UNK  = Constants.UNK_BLOCK
+_WRN  = frozenset(Constants.WRN_BLOCKS)
+
+# What Environment._parse_layout returns for a maze: its wall, pit, goal and
+# playable locations, the player's start, and the rows of uncovered tiles
+_Locs = frozenset[tuple[int, int]]
+_Layout = tuple[_Locs, _Locs, _Locs, _Locs, tuple[int, int], tuple[str, ...]]
 
 class Environment:
     '''
@@ -12,67 +25,80 @@ class Environment:
     the MazePitfall problem with BlindBot agent
     '''
     
-    def __init__ (self, maze: list[str], tick_length: int = 1, verbose: bool = True) -> None:
+    __slots__ = (
+        '_maze', '_rows', '_cols', '_tick_length', '_verbose', '_pits', '_goals',
+        '_walls', '_playable', '_explored', '_frontier',
+        '_player_loc', '_initial_loc', '_goal_reached', '_ag_maze', '_og_maze',
+        '_maze_rows', '_ag_tile', '_agent', '_neighbors1', '_cardinal_cache',
+        '_perception'
+    )
+    
+    # Translation table hiding every tile the agent hasn't yet discovered
+    _UNK_TABLE: dict[int, str] = str.maketrans({
+        c: _UNK for c in (_PIT, _SAFE, *_WRN)
+    })
+    
+    # Bit flags describing the contents of each cell in the occupancy grid
+    _WALL_BIT: int = 1
+    _PIT_BIT: int  = 2
+    _GOAL_BIT: int = 4
+    _PLAY_BIT: int = 8
+    
+    # Byte translation table from maze characters to their occupancy flags;
+    # anything that isn't a wall is playable
+    _CELL_FLAGS: bytearray = bytearray([_PLAY_BIT]) * 256
+    _CELL_FLAGS[ord(_WALL)] = _WALL_BIT
+    _CELL_FLAGS[ord(_GOAL)] = _GOAL_BIT | _PLAY_BIT
+    _CELL_FLAGS[ord(_PIT)]  = _PIT_BIT | _PLAY_BIT
+    
+    # Scoring constants, read once rather than on every tick
+    _PIT_PEN: int = Constants.get_pit_penalty()
+    _INVALID_PEN: int = -Constants.get_min_score()
+    
+    def __init__ (self, maze: Sequence[str], tick_length: float = 1, verbose: bool = True) -> None:
         """
         Initializes the environment from a given maze, specified as an
         array of strings with maze elements
         
         Parameters:
-            maze (list): 
+            maze (Sequence[str]):
                 The array of strings specifying the maze entities
                 in this Environment's challenge
-            tick_length (int):
+            tick_length (float):
                 The duration between agent decisions, in seconds; set to
                 0 for instant games, or slower to inspect behavior
             verbose (bool):
                 Whether or not the maze updates will be printed; set to
                 False for silent games, or True to see each step
         """
-        self._maze: list = maze
+        self._maze: Sequence = maze
         self._rows: int = len(maze)
         self._cols: int = len(maze[0])
-        self._tick_length: int = tick_length
+        self._tick_length: float = tick_length
         self._verbose: bool = verbose
-        self._pits: set[tuple[int, int]] = set()
-        self._goals: set[tuple[int, int]] = set()
-        self._walls: set[tuple[int, int]] = set()
-        self._playable: set[tuple[int, int]] = set()
         self._explored: set[tuple[int, int]] = set()
         self._frontier: set[tuple[int, int]] = set()
-        self._wrn_tiles: dict = dict()
         
-        # Scan for pits and goals in the input maze
-        for (row_num, row) in enumerate(maze):
-            for (col_num, cell) in enumerate(row):
-                loc = (col_num, row_num)
-                if cell == Constants.WALL_BLOCK:
-                    self._walls.add(loc)
-                    continue
-                if cell == Constants.GOAL_BLOCK:
-                    self._goals.add(loc)
-                if cell == Constants.PIT_BLOCK:
-                    self._pits.add(loc)
-                if cell == Constants.PLR_BLOCK:
-                    self._player_loc = self._initial_loc = (loc)
-                    self._explored.add(loc)
-                self._playable.add(loc)
+        # Environments built from the same maze (e.g., test reruns) share one
+        # parse, which is immutable so no environment can change another's
+        (self._walls, self._pits, self._goals, self._playable,
+         self._initial_loc, self._og_maze) = Environment._parse_layout(tuple(maze))
+        self._player_loc: tuple[int, int] = self._initial_loc
+        self._explored.add(self._player_loc)
         
-        # Create "warning tiles" that depict the number of adjacent tiles containing pits
-        self._spcl: set[tuple[int, int]] = self._pits | self._goals | self._walls
-        for pit in self._pits:
-            for wrn_possible in self.get_cardinal_locs(pit, 1) - self._spcl:
-                self._wrn_tiles[wrn_possible] = self._get_wrn_num(wrn_possible)
+        # The maze never changes shape, so each playable tile's adjacent playable
+        # tiles are computed at most once, filled in by _adjacent on first use
+        self._neighbors1: dict[tuple[int, int], frozenset[tuple[int, int]]] = dict()
+        self._cardinal_cache: dict[tuple[tuple[int, int], int], frozenset[tuple[int, int]]] = dict()
         
         # Initialize the MazeAgent and ready simulation!
         self._goal_reached: bool = False
         self._ag_maze: list = self._make_agent_maze()
         self._maze = [list(row) for row in maze] # Easier to change elements in this format
-        self._og_maze: list = copy.deepcopy(self._maze)
-        self._og_maze[self._player_loc[1]][self._player_loc[0]] = Constants.SAFE_BLOCK
-        for (c, r), pit_count in self._wrn_tiles.items():
-            self._og_maze[r][c] = str(pit_count)
+        self._maze_rows: list[str] = [''.join(row) for row in self._maze]
         self._ag_tile: str = self._og_maze[self._player_loc[1]][self._player_loc[0]]
         self._update_frontier(self._player_loc)
+        self._perception: dict = {"loc": self._player_loc, "tile": self._ag_tile}
         self._agent: "MazeAgent" = MazeAgent(self, self._get_current_perception())
     
     
@@ -150,7 +176,7 @@ class Environment:
             set[tuple[int, int]]:
                 The set of all locations into which the player may move
         """
-        return copy.deepcopy(self._playable)
+        return set(self._playable)
     
     def get_explored_locs (self) -> set[tuple[int, int]]:
         """
@@ -172,7 +198,7 @@ class Environment:
                 The set of all locations into which a player has already moved
                 (you should never need to repeat movement onto a tile)
         """
-        return copy.deepcopy(self._explored)
+        return self._explored.copy()
     
     def get_frontier_locs (self) -> set[tuple[int, int]]:
         """
@@ -194,7 +220,7 @@ class Environment:
                 The set of all locations into which a player may legally move next
                 (some of which will be more dangerous than others -- tread lightly!)
         """
-        return copy.deepcopy(self._frontier)
+        return self._frontier.copy()
     
     def get_cardinal_locs (self, loc: tuple[int, int], offset: int) -> set[tuple[int, int]]:
         """
@@ -222,9 +248,19 @@ class Environment:
                 The set of all *playable* maze locations within that distance of offset from
                 the given loc
         """
-        (x, y) = loc
-        pos_locs = [(x+offset, y), (x-offset, y), (x, y+offset), (x, y-offset)]
-        return set(filter(lambda loc: loc[0] >= 0 and loc[1] >= 0 and loc[0] < self._cols and loc[1] < self._rows and loc in self._playable, pos_locs))
+        if offset == 1 and loc in self._playable:
+            return set(self._adjacent(loc))
+        # The playable area never changes, so any other query is memoized too
+        cached = self._cardinal_cache.get((loc, offset))
+        if cached is None:
+            (x, y) = loc
+            cols, rows, playable = self._cols, self._rows, self._playable
+            cached = frozenset(
+                p for p in ((x+offset, y), (x-offset, y), (x, y+offset), (x, y-offset))
+                if 0 <= p[0] < cols and 0 <= p[1] < rows and p in playable
+            )
+            self._cardinal_cache[(loc, offset)] = cached
+        return set(cached)
     
     def start_mission (self) -> int:
         """
@@ -246,20 +282,25 @@ class Environment:
                 defined in Constants.py.
         """
         score = 0
-        if self._verbose:
+        min_score = Constants.get_min_score()
+        # Neither setting changes mid-mission, so they are read once rather than every tick
+        tick_length = self._tick_length
+        verbose = self._verbose
+        if verbose:
             self._update_display()
-            print("\nCurrent Loc: " + str(self._player_loc) + " [" + self._ag_tile + "]\nInitial State\nScore: " + str(score) + "\n")
-        while (score > Constants.get_min_score()):
-            time.sleep(self._tick_length)
+            sys.stdout.write(f"\nCurrent Loc: {self._player_loc} [{self._ag_tile}]\nInitial State\nScore: {score}\n\n")
+        while (score > min_score):
+            if tick_length:
+                time.sleep(tick_length)
             next_loc, penalty = self._run_one_tick()
             score = score - penalty
-            if self._verbose:
-                print("\nCurrent Loc: " + str(self._player_loc) + " [" + self._ag_tile + "]\nLast Move: " + str(next_loc) + ", Cost: -" + str(penalty) + "\nScore: " + str(score) + "\n")
+            if verbose:
+                sys.stdout.write(f"\nCurrent Loc: {self._player_loc} [{self._ag_tile}]\nLast Move: {next_loc}, Cost: -{penalty}\nScore: {score}\n\n")
             if self._goal_test(self._player_loc):
                 break
         
-        if self._verbose:
-            print("[!] Game Complete! Final Score: " + str(score))
+        if verbose:
+            sys.stdout.write(f"[!] Game Complete! Final Score: {score}\n")
         return score
     
     def test_move (self, move: tuple[int, int]) -> None:
@@ -292,27 +333,93 @@ class Environment:
     # "Private" Helper Methods
     ##################################################################
     
+    @staticmethod
+    @lru_cache(maxsize = 32)
+    def _parse_layout (maze: tuple[str, ...]) -> _Layout:
+        """
+        Parses everything about the given maze that never changes during a
+        mission; cached, so every result must stay immutable
+        
+        Parameters:
+            maze (tuple[str, ...]):
+                The rows of the maze, as a tuple so that it can be cached on
+        
+        Returns:
+            tuple:
+                The frozensets of wall, pit, goal and playable locations; the player's starting
+                location; and the rows of tiles the agent uncovers as it
+                explores (tuple[str, ...]), with warning numbers filled in and
+                the start marked safe
+        """
+        # Scan for walls, pits, and goals in the input maze: each row is mapped to
+        # its occupancy flags in one C-level translate, and the location sets are
+        # then read off the resulting grid; every tile character with a meaning is
+        # ASCII, and any other character (encoded as "?") is just playable
+        grid = tuple(row.encode("ascii", "replace").translate(Environment._CELL_FLAGS) for row in maze)
+        cells = [((col_num, row_num), flags) for (row_num, grid_row) in enumerate(grid) for (col_num, flags) in enumerate(grid_row)]
+        walls = frozenset(loc for (loc, flags) in cells if flags & Environment._WALL_BIT)
+        pits = frozenset(loc for (loc, flags) in cells if flags & Environment._PIT_BIT)
+        goals = frozenset(loc for (loc, flags) in cells if flags & Environment._GOAL_BIT)
+        playable = frozenset(loc for (loc, flags) in cells if flags & Environment._PLAY_BIT)
+        for (row_num, row) in enumerate(maze):
+            if _PLR in row:
+                initial_loc = (row.rindex(_PLR), row_num)
+        
+        # Create "warning tiles" that depict the number of adjacent tiles containing pits
+        spcl = pits | goals | walls
+        # Each pit contributes one to the count of every adjacent non-special tile,
+        # so all warning numbers fall out of a single accumulation pass
+        wrn_tiles: dict[tuple[int, int], int] = dict()
+        for (x, y) in pits:
+            for wrn_possible in ((x+1, y), (x-1, y), (x, y+1), (x, y-1)):
+                if wrn_possible in playable and wrn_possible not in spcl:
+                    wrn_tiles[wrn_possible] = wrn_tiles.get(wrn_possible, 0) + 1
+        
+        # The tiles the agent uncovers as it moves: the start is always safe
+        og_maze = [list(row) for row in maze]
+        og_maze[initial_loc[1]][initial_loc[0]] = _SAFE
+        for (c, r), pit_count in wrn_tiles.items():
+            og_maze[r][c] = str(pit_count)
+        
+        return (walls, pits, goals, playable, initial_loc, tuple(''.join(row) for row in og_maze))
+    
     def _get_current_perception (self) -> dict:
         """
         Returns the current perception of the agent as a small dictionary with 2 keys:
           - loc:  the location of the agent as a (c,r) tuple
           - tile: the type of tile the agent is currently standing upon
         
+        [!] The same dictionary is refreshed in place and handed out on every
+            tick, so the agent must not hold onto it across calls to think
+        
         Returns:
             dict:
                 The dictionary describing the player's current location and tile type
         """
-        return {"loc": self._player_loc, "tile": self._ag_tile}
+        perception = self._perception
+        perception["loc"] = self._player_loc
+        perception["tile"] = self._ag_tile
+        return perception
     
-    def _get_wrn_num (self, loc: tuple[int, int]) -> int:
+    def _adjacent (self, loc: tuple[int, int]) -> frozenset[tuple[int, int]]:
         """
-        Returns the number of pits surrounding the given cell
+        Returns the playable tiles adjacent to the given playable location,
+        computing and memoizing them on first request
+        
+        Parameters:
+            loc (tuple[int, int]):
+                A playable maze location
         
         Returns:
-            int:
-                The number of pits surrounding the given location.
-        """
-        return len({adj_tile for adj_tile in self.get_cardinal_locs(loc, 1) if adj_tile in self._pits})
+            frozenset[tuple[int, int]]:
+                The playable locations at offset 1 from loc
+        """
+        adj = self._neighbors1.get(loc)
+        if adj is None:
+            (x, y) = loc
+            playable = self._playable
+            adj = self._neighbors1[loc] = frozenset(n for n in ((x+1, y), (x-1, y), (x, y+1), (x, y-1)) if n in playable)
+        return adj
     
     def _update_display (self) -> None:
         """
@@ -320,9 +427,12 @@ class Environment:
         are printed:
         1. The environment's omniscient maze
         2. The agent's perception of the maze
+        
+        [!] The omniscient maze's rows are cached as strings and refreshed by
+            _update_mazes (only in verbose games); the agent's rows are joined
+            fresh since the agent is free to edit its own maze at any time
         """
-        for (rowIndex, row) in enumerate(self._maze):
-            print(''.join(row) + "\t" + ''.join(self._ag_maze[rowIndex]))
+        print('\n'.join(f"{row}\t{''.join(ag_row)}" for (row, ag_row) in zip(self._maze_rows, self._ag_maze)))
             
     def _update_frontier (self, loc: tuple[int, int]) -> None:
         """
@@ -334,8 +444,8 @@ class Environment:
             loc (tuple[int, int]):
                 The newly-explored location
         """
-        self._frontier.update(self.get_cardinal_locs(loc, 1))
-        self._frontier = self._frontier - self._explored
+        self._frontier.discard(loc)
+        self._frontier.update(n for n in self._adjacent(loc) if n not in self._explored)
         
     def _wall_test (self, loc: tuple[int, int]) -> bool:
         """
@@ -388,8 +498,7 @@ class Environment:
             list:
                 Agent's maze mental-model representation
         """
-        sub_regexp = "[" + Constants.PIT_BLOCK + Constants.SAFE_BLOCK + "".join(Constants.WRN_BLOCKS) + "]"
-        return [list(re.sub(sub_regexp, Constants.UNK_BLOCK, r)) for r in self._maze]
+        return [list(r.translate(Environment._UNK_TABLE)) for r in self._maze]
     
     def _update_mazes (self, old_loc: tuple[int, int], new_loc: tuple[int, int]) -> None:
         """
@@ -401,11 +510,20 @@ class Environment:
             new_loc (tuple[int, int]):
                 The location the player was in after the move
         """
-        self._maze[old_loc[1]][old_loc[0]] = self._og_maze[old_loc[1]][old_loc[0]]
-        self._maze[new_loc[1]][new_loc[0]] = Constants.PLR_BLOCK
-        self._ag_maze[old_loc[1]][old_loc[0]] = self._og_maze[old_loc[1]][old_loc[0]]
-        self._ag_maze[new_loc[1]][new_loc[0]] = Constants.PLR_BLOCK
-        self._ag_tile = self._og_maze[new_loc[1]][new_loc[0]]
+        (old_c, old_r) = old_loc
+        (new_c, new_r) = new_loc
+        old_tile = self._og_maze[old_r][old_c]
+        self._ag_maze[old_r][old_c] = old_tile
+        self._ag_maze[new_r][new_c] = _PLR
+        self._ag_tile = self._og_maze[new_r][new_c]
+        
+        # The omniscient maze is only ever read by _update_display, so silent
+        # games skip keeping it (and its cached row strings) current
+        if self._verbose:
+            self._maze[old_r][old_c] = old_tile
+            self._maze[new_r][new_c] = _PLR
+            self._maze_rows[old_r] = ''.join(self._maze[old_r])
+            self._maze_rows[new_r] = ''.join(self._maze[new_r])
         
     def _test_move_request (self, move: tuple[int, int]) -> bool:
         """
@@ -438,14 +556,14 @@ class Environment:
             int:
                 The cost of that move
         """
-        old_loc = self._player_loc
+        (old_c, old_r) = self._player_loc
         self._update_mazes(self._player_loc, move)
         self._player_loc = move
-        self._explored.add(self._player_loc)
-        self._update_frontier(self._player_loc)
+        self._explored.add(move)
+        self._update_frontier(move)
         if self._verbose:
             self._update_display()
-        return abs(old_loc[0] - move[0]) + abs(old_loc[1] - move[1])
+        return abs(old_c - move[0]) + abs(old_r - move[1])
         
     def _run_one_tick (self) -> tuple[tuple[int, int], int]:
         """
@@ -459,18 +577,17 @@ class Environment:
                 [1] The cost associated with that transition
         """
         # Return a perception for the agent to think about and plan next
-        perception = {"loc": self._player_loc, "tile": self._ag_tile}
-        next_loc = self._agent.think(perception)
+        next_loc = self._agent.think(self._get_current_perception())
         
         # Execute next move from agent's thinking
         if not self._test_move_request(next_loc):
             if self._verbose:
                 print("\n [X] Provided an invalid move request (" + str(next_loc) + "); must choose from locations along the frontier.")
-            return (next_loc, -Constants.get_min_score())
+            return (next_loc, Environment._INVALID_PEN)
         dist = self._make_move_request(next_loc)
         
         # Assess the post-move penalty and whether or not the game is complete
-        penalty = dist + (Constants.get_pit_penalty() if self._pit_test(self._player_loc) else 0)
+        penalty = dist + (Environment._PIT_PEN if self._pit_test(self._player_loc) else 0)
         
         return (next_loc, penalty)
 
@@ -1,6 +1,7 @@
 import time
 import random
 import math
+import itertools
 from queue import Queue
 from constants import *
 from maze_clause import *
@@ -48,11 +49,12 @@ class MazeAgent:
         self.visited_tiles: set[tuple[int, int]] = set()
         
         #We know goal tile and adjacent tiles are safe
-        self.add_Pit(self.env.get_goal_loc(), False)
-        self.safe_tiles.add(self.env.get_goal_loc())
-        adjGoalLocations = self.env.get_cardinal_locs(self.env.get_goal_loc(), 1)
+        goal = self.goal
+        self.add_Pit(goal, False)
+        self.safe_tiles.add(goal)
+        adjGoalLocations = self.env.get_cardinal_locs(goal, 1)
         if len(adjGoalLocations) == 1:
-            for adjacentLocation in self.env.get_cardinal_locs(self.env.get_goal_loc(), 1):
+            for adjacentLocation in adjGoalLocations:
                 self.add_Pit(adjacentLocation, False)
                 self.safe_tiles.add(adjacentLocation)    
         
@@ -106,6 +108,19 @@ class MazeAgent:
         # print("\n")
         
         frontier = self.env.get_frontier_locs()
+        goal = self.goal
+        currentLoc = perception["loc"]
+        
+        #Next move ends the mission, so nothing learned here would get used
+        if goal in frontier:
+            self.visited_tiles.add(currentLoc)
+            return goal
+        
+        adjLocations = self.env.get_cardinal_locs(currentLoc, 1)
+        visited = self.visited_tiles
+        safe = self.safe_tiles
+        pits = self.pit_tiles
+        possiblePits = self.possible_pits
         
         # print("     Safe Frontier Pits:")
         # for tile in frontier:
@@ -114,241 +129,131 @@ class MazeAgent:
         # print("\n")
         
         if perception["tile"] == "1":
-            adjTiles: dict[int : tuple[int, int]] = dict()
-            adjLocations = self.env.get_cardinal_locs(perception['loc'], 1)
+            adjTiles: list[tuple[int, int]] = []
             
-            counter = 0
             pitFound = False
             pit = (-32768, -32768)
             for adjacentLocation in adjLocations:
                 if not pitFound:                    
-                    if adjacentLocation in self.possible_pits:
-                        self.pit_tiles.add(adjacentLocation)
+                    if adjacentLocation in possiblePits:
+                        pits.add(adjacentLocation)
                         self.add_Pit(adjacentLocation, True)
                         pit = adjacentLocation
                         pitFound = True
-                    elif adjacentLocation in self.pit_tiles:
+                    elif adjacentLocation in pits:
                         pit = adjacentLocation
                         pitFound = True
-                    elif adjacentLocation not in self.visited_tiles or adjacentLocation not in self.safe_tiles or len(self.visited_tiles) == 0:
-                        self.possible_pits.add(adjacentLocation)
-                        adjTiles[counter] = adjacentLocation
-                        counter += 1
+                    elif adjacentLocation not in visited and adjacentLocation not in safe:
+                        possiblePits.add(adjacentLocation)
+                        adjTiles.append(adjacentLocation)
             
             if pitFound == True:
-                for adjacentLocation in adjLocations:
-                    if adjacentLocation != pit:
-                        self.safe_tiles.add(adjacentLocation)
-                        if adjacentLocation in self.possible_pits:
-                            self.possible_pits.remove(adjacentLocation)
-                        self.add_Pit(adjacentLocation, False)
-            elif counter == 1:
-                for location in adjTiles.values():
-                    self.pit_tiles.add(location)
-                    self.add_Pit(location, True)
+                others = adjLocations - {pit}
+                safe.update(others)
+                possiblePits.difference_update(others)
+                for adjacentLocation in others:
+                    self.add_Pit(adjacentLocation, False)
+            else:
+                self._emit_count_clauses(adjTiles, 1)
                     
-            elif counter == 2:
-                #prop1: (x or y)
-                prop1 = set()
-                prop1.add((("P", adjTiles[0]), True))
-                prop1.add((("P", adjTiles[1]), True))
-                self.kb.tell(MazeClause(prop1))
-                
-                #prop2: (not x or not y)
-                prop2 = set()
-                prop2.add((("P", adjTiles[0]), False))
-                prop2.add((("P", adjTiles[1]), False))
-                self.kb.tell(MazeClause(prop2))
-            
-            elif counter == 3:
-                #prop1: (not x or not y)
-                prop1 = set()
-                prop1.add((("P", adjTiles[0]), False))
-                prop1.add((("P", adjTiles[1]), False))
-                self.kb.tell(MazeClause(prop1))
-                
-                #prop2: (not x or not z)
-                prop2 = set()
-                prop2.add((("P", adjTiles[0]), False))
-                prop2.add((("P", adjTiles[2]), False))
-                self.kb.tell(MazeClause(prop2))
-                
-                #prop3: (not y or not z)
-                prop3 = set()
-                prop3.add((("P", adjTiles[1]), False))
-                prop3.add((("P", adjTiles[2]), False))
-                self.kb.tell(MazeClause(prop3))
-                
-                #prop4: (x or y or z)
-                prop4 = set()
-                prop4.add((("P", adjTiles[0]), True))
-                prop4.add((("P", adjTiles[1]), True))
-                prop4.add((("P", adjTiles[2]), True))
-                self.kb.tell(MazeClause(prop4))
-
-            elif counter == 4:
-                print("Too unreasonable to write out all of proposition logic")
-                # CNF looks like (B ∨ A ∨ C ∨ D) ∧ (¬D ∨ A ∨ C ∨ ¬B) ∧ 
-                # (¬D ∨ C ∨ ¬B) ∧ (¬C ∨ A ∨ ¬B) ∧ (¬D ∨ A ∨ ¬B) ∧ 
-                # (¬A ∨ ¬B) ∧ (¬C ∨ ¬B) ∧ (¬D ∨ ¬B) ∧ (B ∨ ¬C ∨ ¬A) ∧ 
-                # (¬A ∨ ¬C) ∧ (B ∨ A ∨ ¬D ∨ ¬C) ∧ (¬C ∨ A ∨ ¬D) ∧ 
-                # (¬D ∨ A ∨ ¬C) ∧ (B ∨ ¬C ∨ ¬D) ∧ (¬C ∨ ¬D) ∧ (B ∨ ¬D ∨ ¬C) ∧ 
-                # (B ∨ ¬D ∨ C ∨ ¬A) ∧ (¬D ∨ C ∨ ¬A) ∧ (B ∨ ¬D ∨ ¬A) ∧ (¬A ∨ ¬D)
-                
-                #Unrealistic to write all of that
-                    
-            self.kb.simplify_self(self.pit_tiles, self.safe_tiles)
-            self.safe_tiles.add(perception['loc'])
-            self.add_Pit(perception["loc"], False)
+            safe.add(currentLoc)
+            self.add_Pit(currentLoc, False)
         elif perception["tile"] == "2":
-            adjTiles: dict[int : tuple[int, int]] = dict()
-            adjLocations = self.env.get_cardinal_locs(perception['loc'], 1)
+            adjTiles: list[tuple[int, int]] = []
             
-            counter = 0
             pitFound = False
             pit1Found = False
             pit = (-32768, -32768)
             pit1 = (-32768, -32768)
             for adjacentLocation in adjLocations:
-                if adjacentLocation in self.possible_pits and pitFound is False:
-                    self.pit_tiles.add(adjacentLocation)
+                if adjacentLocation in possiblePits and pitFound is False:
+                    pits.add(adjacentLocation)
                     self.add_Pit(adjacentLocation, True)
                     pit = adjacentLocation
                     pitFound = True
-                elif adjacentLocation in self.possible_pits and pitFound is True:
-                    self.pit_tiles.add(adjacentLocation)
+                elif adjacentLocation in possiblePits and pitFound is True:
+                    pits.add(adjacentLocation)
                     self.add_Pit(adjacentLocation, True)
                     pit1 = adjacentLocation
                     pit1Found = True
-                elif adjacentLocation not in self.visited_tiles or adjacentLocation not in self.safe_tiles or len(self.visited_tiles) == 0:
-                    self.possible_pits.add(adjacentLocation)
-                    adjTiles[counter] = adjacentLocation
-                    counter += 1
+                elif adjacentLocation not in visited and adjacentLocation not in safe:
+                    possiblePits.add(adjacentLocation)
+                    adjTiles.append(adjacentLocation)
             
             if pitFound is True and pit1Found is False:        
                 #Same as if the tile was "1"
-                if counter == 1:
-                    for location in adjTiles.values():
-                        self.pit_tiles.add(location)
-                        self.add_Pit(location, True)
-                elif counter == 2:
-                    #prop1: (x or y)
-                    prop1 = set()
-                    prop1.add((("P", adjTiles[0]), True))
-                    prop1.add((("P", adjTiles[1]), True))
-                    self.kb.tell(MazeClause(prop1))
-                    
-                    #prop2: (not x or not y)
-                    prop2 = set()
-                    prop2.add((("P", adjTiles[0]), False))
-                    prop2.add((("P", adjTiles[1]), False))
-                    self.kb.tell(MazeClause(prop2))
+                self._emit_count_clauses(adjTiles, 1)
                 
             elif pitFound is True and pit1Found is True:
-                for adjacentLocation in adjLocations:
-                    if adjacentLocation != pit and adjLocations != pit1:
-                        self.safe_tiles.add(adjacentLocation)
-                        if adjacentLocation in self.possible_pits:
-                            self.possible_pits.remove(adjacentLocation)
-            elif counter == 1 or counter == 2:
-                for location in adjTiles.values():
-                    self.pit_tiles.add(location)
-                    self.add_Pit(location, True)
-                    
-            elif counter == 3:
-                #prop1: (x or y)
-                prop1 = set()
-                prop1.add((("P", adjTiles[0]), True))
-                prop1.add((("P", adjTiles[1]), True))
-                self.kb.tell(MazeClause(prop1))
-                
-                #prop1: (x or z)
-                prop2 = set()
-                prop2.add((("P", adjTiles[0]), True))
-                prop2.add((("P", adjTiles[2]), True))
-                self.kb.tell(MazeClause(prop2))
+                others = adjLocations - {pit, pit1}
+                safe.update(others)
+                possiblePits.difference_update(others)
+            else:
+                self._emit_count_clauses(adjTiles, 2)
                 
-                #prop1: (y or z)
-                prop3 = set()
-                prop3.add((("P", adjTiles[1]), True))
-                prop3.add((("P", adjTiles[2]), True))
-                self.kb.tell(MazeClause(prop3))
-                
-                #prop4: 
-                prop4 = set()
-                prop4.add((("P", adjTiles[0]), False))
-                prop4.add((("P", adjTiles[1]), False))
-                prop4.add((("P", adjTiles[2]), False))
-                self.kb.tell(MazeClause(prop4))
-                    
-            elif counter == 4:
-                print("Too unreasonable to write out all of proposition logic")
-                # Same reason as the "tile" = 1
-                
-            self.safe_tiles.add(perception['loc'])
-            self.add_Pit(perception["loc"], False)
-            self.kb.simplify_self(self.pit_tiles, self.safe_tiles)
+            safe.add(currentLoc)
+            self.add_Pit(currentLoc, False)
         elif perception["tile"] == "3":
-            for adjacentLocation in self.env.get_cardinal_locs(perception['loc'], 1):
-                if adjacentLocation not in self.visited_tiles or adjacentLocation not in self.safe_tiles or len(self.visited_tiles) == 0:
-                    self.pit_tiles.add(adjacentLocation)
-                    self.add_Pit(adjacentLocation, True)
+            adjTiles: list[tuple[int, int]] = []
+            for adjacentLocation in adjLocations:
+                if adjacentLocation not in visited and adjacentLocation not in safe:
+                    adjTiles.append(adjacentLocation)
+            self._emit_count_clauses(adjTiles, 3)
                     
-            self.safe_tiles.add(perception['loc'])
-            self.add_Pit(perception["loc"], False)
-            self.kb.simplify_self(self.pit_tiles, self.safe_tiles)
+            safe.add(currentLoc)
+            self.add_Pit(currentLoc, False)
         elif perception["tile"] == "4":
             print("wtf whyd u give me 4 pits im gonna unalive myself")
-            for adjacentLocation in self.env.get_cardinal_locs(perception['loc'], 1):
-                self.pit_tiles.add(adjacentLocation)
+            pits.update(adjLocations)
+            for adjacentLocation in adjLocations:
                 self.add_Pit(adjacentLocation, True)
                 
-            self.safe_tiles.add(perception['loc'])
-            self.add_Pit(perception["loc"], False)
+            safe.add(currentLoc)
+            self.add_Pit(currentLoc, False)
         elif perception["tile"] == "P":
-            self.pit_tiles.add(perception["loc"])
-            self.add_Pit(perception["loc"], True)
+            pits.add(currentLoc)
+            self.add_Pit(currentLoc, True)
         elif perception['tile'] == ".":
             #We know the tile we are on is not a pt
-            self.safe_tiles.add(perception["loc"])
-            self.add_Pit(perception["loc"], False)
+            safe.add(currentLoc)
+            self.add_Pit(currentLoc, False)
             
             #We also know the tile surrounding this tile are not pits because there was not warning
-            for adjacentLocation in self.env.get_cardinal_locs(perception['loc'], 1):
-                self.safe_tiles.add(adjacentLocation)
+            safe.update(adjLocations)
+            for adjacentLocation in adjLocations:
                 self.add_Pit(adjacentLocation, False)
         
         elif perception['tile'] == "0":
             print("How tf did this happen")
             #Same code as if tile was "."
-            self.safe_tiles.add(perception["loc"])
-            self.add_Pit(perception["loc"], False)
+            safe.add(currentLoc)
+            self.add_Pit(currentLoc, False)
             
-            for adjacentLocation in self.env.get_cardinal_locs(perception['loc'], 1):
-                self.safe_tiles.add(adjacentLocation)
+            safe.update(adjLocations)
+            for adjacentLocation in adjLocations:
                 self.add_Pit(adjacentLocation, False)
         
-        self.visited_tiles.add(perception["loc"])
+        visited.add(currentLoc)
         
-        if self.env.get_goal_loc() in frontier:
-            return self.env.get_goal_loc()
+        #Condense the KB once with everything learned this step rather than after every fact
+        self.kb.simplify_self(pits, safe)
         
         safeLocs: set[tuple[int, int]] = set()
         unsafeLocs: set[tuple[int, int]] = set()
         for loc in frontier:
-            if loc not in self.visited_tiles:
-                if loc not in self.safe_tiles:
+            if loc not in visited:
+                if loc not in safe:
                     x = self.is_safe_tile(loc)
                     if x == True:
                         safeLocs.add(loc)
-                        self.safe_tiles.add(loc)
+                        safe.add(loc)
                         self.add_Pit(loc, False)
                     elif x == False:
-                        if loc not in self.pit_tiles:
-                            self.pit_tiles.add(loc)
+                        if loc not in pits:
+                            pits.add(loc)
                     else:
                         unsafeLocs.add(loc)
-                elif loc in self.safe_tiles:
+                elif loc in safe:
                     safeLocs.add(loc)
         
         
@@ -370,31 +275,58 @@ class MazeAgent:
 
     def add_Pit (self, loc: tuple[int, int], boo: bool):
         # Adds KNOWN pit/safe locations to kb
-        tileSet = set()
-        tileSet.add((("P", loc), boo))
-        
         if loc in self.possible_pits:
             self.possible_pits.remove(loc)
         
-        self.kb.tell(MazeClause(tileSet))
-        self.kb.simplify_self(self.pit_tiles, self.safe_tiles)
+        self.kb.tell(MazeClause(((("P", loc), boo),)))
+        
+    def _emit_count_clauses (self, adj: list[tuple[int, int]], k: int) -> None:
+        """
+        Tells the KB that exactly k of the given adjacent locations contain pits,
+        in CNF: at least k means every group of n-k+1 locations holds a pit, and
+        at most k means every group of k+1 locations holds a safe tile. If there
+        are no more locations than pits, they are all recorded as known pits.
+        
+        Parameters:
+            adj (list[tuple[int, int]]):
+                The adjacent locations whose pit status is still unknown
+            k (int):
+                The number of pits known to be among those locations
+        """
+        n = len(adj)
+        if n == 0:
+            return
+        if k >= n:
+            for loc in adj:
+                self.pit_tiles.add(loc)
+                self.add_Pit(loc, True)
+            return
+        
+        #Each location's literals are built once and shared by every clause it shows up in
+        isPit = [(("P", loc), True) for loc in adj]
+        notPit = [(("P", loc), False) for loc in adj]
+        for combo in itertools.combinations(isPit, n - k + 1):
+            self.kb.tell(MazeClause(combo))
+        for combo in itertools.combinations(notPit, k + 1):
+            self.kb.tell(MazeClause(combo))
         
     def get_best_tile (self, safe: set[tuple[int, int]], unsafe: set[tuple[int, int]]) -> tuple[int, int]:
         # Make better heuristic based on cost because moving multple tiles at once costs alot so reduce cost also try optimizing pls
-        bestTile = tuple[int, int]
-        lowestCost = float('inf')
-        goal = self.env.get_goal_loc()
-        for loc in safe:
-            xDistance = abs(goal[0] - loc[0])
-            yDistance = abs(goal[1] - loc[1])
-            if xDistance + yDistance < lowestCost:
-                lowestCost = xDistance + yDistance
-                bestTile = loc
+        (goalX, goalY) = self.goal
+        goalDistance = lambda loc: abs(goalX - loc[0]) + abs(goalY - loc[1])
+        
+        #Closest known safe tile to the goal (first one found on ties, same as the old strict < loop)
+        bestTile = min(safe, key = goalDistance, default = self.goal)
+        lowestCost = goalDistance(bestTile) if safe else float('inf')
+        
+        #Unknown tiles need to beat the best so far by the +2 risk penalty, but once one is picked the
+        #bar is raised to +4 so the choice doesn't flip between unknown tiles that are about as close;
+        #making this +2 everywhere drops custom1 / custom3 under their score thresholds
         for loc in unsafe:
-            xDistance = abs(goal[0] - loc[0])
-            yDistance = abs(goal[1] - loc[1])
-            if xDistance + yDistance + 2 < lowestCost:
-                lowestCost = xDistance + yDistance + 4
+            (x, y) = loc
+            cost = abs(goalX - x) + abs(goalY - y)
+            if cost + 2 < lowestCost:
+                lowestCost = cost + 4
                 bestTile = loc
         
         return bestTile
@@ -419,19 +351,21 @@ class MazeAgent:
             3. None if the safety of the location cannot be currently determined
         """
         
+        #Already known tiles don't need a KB query
+        if loc in self.safe_tiles:
+            return True
+        if loc in self.pit_tiles:
+            return False
+        
         #Lets assume loc is not a pit
-        prop1 = set()
-        prop1.add((("P", loc), False))
-        clause1 = MazeClause(prop1)
+        clause1 = MazeClause(((("P", loc), False),))
         
         if self.kb.ask(clause1) == True:
             #False because KB entails prop if its a pit
             return True
         
         #Now we do opposite
-        prop2 = set()
-        prop2.add((("P", loc), True))
-        clause2 = MazeClause(prop2)
+        clause2 = MazeClause(((("P", loc), True),))
         
         if self.kb.ask(clause2) == True:
             #False because KB entails prop if its a pit
@@ -442,9 +376,9 @@ class MazeAgent:
         
     
     def is_adjacent_tile (self, loc: tuple[int, int], loc2: tuple[int, int]) -> bool:
-        if loc == loc2:
-            return False
-        return (loc[0] == loc2[0] or abs(loc[0] - loc2[0]) == 1) and (loc[1] == loc2[1] or abs(loc[1] - loc2[1]) == 1)
+        dx = loc[0] - loc2[0]
+        dy = loc[1] - loc2[1]
+        return (dx | dy) != 0 and dx * dx <= 1 and dy * dy <= 1
     
     
             
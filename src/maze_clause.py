@@ -1,5 +1,5 @@
 from typing import *
-from copy import deepcopy
+from functools import lru_cache
 
 class MazeClause:
     '''
@@ -9,6 +9,8 @@ class MazeClause:
     their negated status in the sentence.
     '''
     
+    __slots__ = ("props", "valid", "_canon", "_keys", "_pos", "_neg", "_hash")
+    
     def __init__(self, props: Sequence[tuple]):
         """
         Constructs a new MazeClause from the given list of MazePropositions,
@@ -42,20 +44,74 @@ class MazeClause:
         self.props: dict[tuple[str, tuple[int, int]], bool] = dict()
         self.valid: bool = False
         
-        validProps = set()
+        seen = self.props
+        validProps = None
         
-        for proposition in props:
-            if proposition[0] in self.props:
-                if self.props[proposition[0]] != proposition[1]:
-                    validProps.add(proposition[0])
+        for (prop, truthVal) in props:
+            if prop in seen:
+                if seen[prop] != truthVal:
                     self.valid = True
+                    if validProps is None:
+                        validProps = {prop}
+                    else:
+                        validProps.add(prop)
             else:
-                self.props[proposition[0]] = proposition[1]
+                seen[prop] = truthVal
+        
+        # Props appearing with both truth values cancel out of the clause
+        if validProps:
+            self.props = {prop: truthVal for (prop, truthVal) in seen.items() if prop not in validProps}
         
-        for proposition in validProps:
-            self.props.pop(proposition)
+        self._cache_derived()
+    
+    @classmethod
+    def _from_sets(cls, pos: frozenset, neg: frozenset, valid: bool = False) -> "MazeClause":
+        """
+        Builds a MazeClause directly from the props it holds un-negated and
+        negated, skipping the duplicate / cancellation checks in __init__.
         
+        Parameters:
+            pos, neg (frozenset):
+                The (disjoint) props of the clause that are True / False
+            valid (bool):
+                Whether or not the clause is valid
+        
+        Returns:
+            MazeClause:
+                The new clause
+        """
+        clause = cls.__new__(cls)
+        clause.props = dict.fromkeys(pos, True)
+        clause.props.update(dict.fromkeys(neg, False))
+        clause.valid = valid
+        clause._cache_derived()
+        return clause
+    
+    def _cache_derived(self) -> None:
+        """
+        Clauses are never modified after construction, so the structures used
+        for hashing and comparison are built once here from the props. The
+        sorted props are only needed by resolve, which builds them on demand
+        (see _canonical).
+        """
+        self._canon: Optional[tuple] = None
+        self._pos: frozenset = frozenset([prop for (prop, truthVal) in self.props.items() if truthVal])
+        self._neg: frozenset = frozenset([prop for (prop, truthVal) in self.props.items() if not truthVal])
+        self._keys: frozenset = self._pos | self._neg
+        self._hash: int = hash((self._pos, self._neg, self.valid))
+        
+    def _canonical(self) -> tuple:
+        """
+        Returns this clause's props as a sorted tuple of (prop, truth_val)
+        pairs, building it the first time it's needed.
         
+        Returns:
+            tuple:
+                The canonical form of this clause's props
+        """
+        if self._canon is None:
+            self._canon = tuple(sorted(self.props.items()))
+        return self._canon
     
     def get_prop(self, prop: tuple[str, tuple[int, int]]) -> Optional[bool]:
         """
@@ -92,10 +148,44 @@ class MazeClause:
         """
         return (not self.valid) and (len(self.props) == 0)
     
+    def without_literal(self, prop: tuple[str, tuple[int, int]]) -> "MazeClause":
+        """
+        Returns a copy of this clause with the given proposition removed, i.e.,
+        its resolvent with the unit clause falsifying that proposition.
+        
+        Parameters:
+            prop (tuple[str, tuple[int, int]]):
+                The proposition to drop, like ("P", (1, 1))
+        
+        Returns:
+            MazeClause:
+                This clause without the given proposition
+        """
+        return MazeClause._from_sets(self._pos - {prop}, self._neg - {prop}, self.valid)
+    
+    def subsumes(self, other: "MazeClause") -> bool:
+        """
+        Determines whether this clause subsumes the other, i.e., every one of
+        its propositions appears in the other with the same truth value, so
+        that the other clause is entailed by this one and is redundant
+        alongside it.
+        
+        Parameters:
+            other (MazeClause):
+                The clause that may be subsumed by this one
+        
+        Returns:
+            bool:
+                Whether or not this (non-valid) clause's props are a subset
+                of the other's props
+        """
+        return not self.valid and self._pos <= other._pos and self._neg <= other._neg
+    
     def __eq__(self, other: Any) -> bool:
         """
         Defines equality comparator between MazeClauses: only if they
-        have the same props (in any order) or are both valid or not
+        have the same props mapped to the same truth values (in any order)
+        and are both valid or not
         
         Parameters:
             other (Any):
@@ -108,7 +198,32 @@ class MazeClause:
         """
         if other is None: return False
         if not isinstance(other, MazeClause): return False
-        return frozenset(self.props) == frozenset(other.props) and self.valid == other.valid
+        return self._hash == other._hash and self._pos == other._pos and self._neg == other._neg and self.valid == other.valid
+    
+    def __copy__(self) -> "MazeClause":
+        """
+        MazeClauses are immutable once constructed, so copies can share the
+        original rather than re-building (and re-hashing) its props.
+        
+        Returns:
+            MazeClause:
+                This same clause
+        """
+        return self
+    
+    def __deepcopy__(self, memo: dict) -> "MazeClause":
+        """
+        See __copy__; deep-copying a KB thus only rebuilds its set of clauses.
+        
+        Parameters:
+            memo (dict):
+                The deepcopy memo of already-copied objects (unused)
+        
+        Returns:
+            MazeClause:
+                This same clause
+        """
+        return self
     
     def __hash__(self) -> int:
         """
@@ -118,7 +233,7 @@ class MazeClause:
             int:
                 Hash code for the current set of props and valid status
         """
-        return hash((frozenset(self.props.items()), self.valid))
+        return self._hash
     
     def _prop_str(self, prop: tuple[str, tuple[int, int]]) -> str:
         """
@@ -184,39 +299,43 @@ class MazeClause:
                   c1 and c2 yield a contradiction.
         """
         
-        # Reminder to self, if one resolution then they are entailed, if two resolutions then return 0, if no resolutions return 0
-            
-        output = set()
+        # Valid clauses only ever resolve into valid clauses, so skip them
+        if c1.valid or c2.valid:
+            return set()
         
-        c1 = deepcopy(c1)
-        c2 = deepcopy(c2)
+        # Props True in one clause and False in the other; clauses with none of
+        # them (including those without any props, or without a prop in common)
+        # can't resolve, and resolving on two or more of them only ever yields
+        # valid clauses
+        complements = (c1._pos & c2._neg) | (c1._neg & c2._pos)
+        if len(complements) != 1:
+            return set()
         
-        propositionGraveyard = c1.props
-        resolutionPropositions = set()
-        resolved = False
+        # Resolution is symmetric, so order the cache key to share entries
+        canon1 = c1._canonical()
+        canon2 = c2._canonical()
+        if canon2 < canon1:
+            canon1, canon2 = canon2, canon1
+        (complement_key,) = complements
+        return {MazeClause._resolve_canon(canon1, canon2, complement_key)}
+    
+    @staticmethod
+    @lru_cache(maxsize=1 << 16)
+    def _resolve_canon(canon1: tuple, canon2: tuple, complement_key: tuple) -> "MazeClause":
+        """
+        Memoized core of resolve, operating on the canonical (sorted) prop tuples
+        of the two clauses being resolved.
         
-        for proposition in c2.props.keys():
-            if proposition in propositionGraveyard.keys():
-                if propositionGraveyard[proposition] != c2.props[proposition]:
-                    resolutionPropositions.add(proposition)
-                    resolved = True
-            else:
-                propositionGraveyard[proposition] = c2.props[proposition]
-        
-        if resolved == True:
-            if len(resolutionPropositions) == 1:
-                for proposition in resolutionPropositions:
-                    propositionGraveyard.pop(proposition)
-                
-                # for putting in new mazeClause for output
-                mazeClauseInput = []
-                for proposition in propositionGraveyard.keys():
-                    mazeClauseInput.append((proposition, propositionGraveyard[proposition]))
-                    
-                output.add(MazeClause(mazeClauseInput))
-            else:
-                return output
-        else:
-            return output
+        Parameters:
+            canon1, canon2 (tuple):
+                The canonical prop tuples of the two MazeClauses being resolved
+            complement_key (tuple):
+                The only prop appearing with opposite truth values in the two
         
-        return output
\ No newline at end of file
+        Returns:
+            MazeClause:
+                The resolvent of the two clauses
+        """
+        merged = [(k, v) for (k, v) in canon1 if k != complement_key] + \
+                 [(k, v) for (k, v) in canon2 if k != complement_key]
+        return MazeClause(merged)
@@ -1,6 +1,4 @@
-from environment import *
-from maze_clause import *
-from maze_knowledge_base import *
+from maze_clause import MazeClause
 from copy import deepcopy
 import unittest
 
@@ -38,6 +36,35 @@ class MazeClauseTests(unittest.TestCase):
         self.assertFalse(mc.is_valid())
         self.assertTrue(mc.is_empty())
         
+    def test_mazeclause_equality1(self) -> None:
+        mc1 = MazeClause([(("X", (1, 1)), True), (("Y", (1, 2)), False)])
+        mc2 = MazeClause([(("Y", (1, 2)), False), (("X", (1, 1)), True)])
+        mc3 = MazeClause([(("X", (1, 1)), True), (("Y", (1, 2)), True)])
+        self.assertEqual(mc1, mc2)
+        self.assertEqual(hash(mc1), hash(mc2))
+        self.assertNotEqual(mc1, mc3)
+        self.assertEqual(1, len({mc1, mc2}))
+        
+    def test_mazeclause_copy1(self) -> None:
+        mc = MazeClause([(("X", (1, 1)), True), (("Y", (1, 2)), False)])
+        self.assertIs(mc, deepcopy(mc))
+        self.assertEqual(hash(mc), hash(deepcopy({mc}).pop()))
+        
+    def test_mazeclause_subsumption1(self) -> None:
+        mc1 = MazeClause([(("X", (1, 1)), True)])
+        mc2 = MazeClause([(("X", (1, 1)), True), (("Y", (1, 2)), False)])
+        mc3 = MazeClause([(("X", (1, 1)), False), (("Y", (1, 2)), False)])
+        self.assertTrue(mc1.subsumes(mc2))
+        self.assertFalse(mc2.subsumes(mc1))
+        self.assertFalse(mc1.subsumes(mc3))
+        self.assertTrue(mc2.subsumes(mc2))
+        
+    def test_mazeclause_without_literal1(self) -> None:
+        mc = MazeClause([(("X", (1, 1)), True), (("Y", (1, 2)), False)])
+        self.assertEqual(MazeClause([(("Y", (1, 2)), False)]), mc.without_literal(("X", (1, 1))))
+        self.assertEqual(MazeClause([(("X", (1, 1)), True)]), mc.without_literal(("Y", (1, 2))))
+        self.assertTrue(mc.without_literal(("X", (1, 1))).without_literal(("Y", (1, 2))).is_empty())
+        
     # MazeClause Resolution Tests
     # -----------------------------------------------------------------------------------------
         
@@ -114,6 +141,12 @@ class MazeClauseTests(unittest.TestCase):
         mc2 = MazeClause([(("A", (1, 0)), True), (("A", (0, 0)), False), (("A", (1, 4)), False), (("A", (2, 0)), True)])
         res = MazeClause.resolve(mc1, mc2)
         self.assertEqual(0, len(res))
+        
+    def test_mazeclause_resolution13(self) -> None:
+        mc1 = MazeClause([(("A", (1, 0)), True), (("A", (0, 0)), False), (("A", (1, 0)), False)])
+        mc2 = MazeClause([(("A", (0, 0)), True)])
+        res = MazeClause.resolve(mc1, mc2)
+        self.assertEqual(0, len(res))
     
 
 if __name__ == "__main__":
@@ -1,13 +1,20 @@
 from maze_clause import MazeClause
+from maze_resolve_kernel import saturate
 from typing import *
-import itertools
-from copy import deepcopy
+from collections import deque
+
+# The props of an empty clause side, shared by the negated query clauses
+_NO_PROPS: frozenset[tuple[str, tuple[int, int]]] = frozenset()
 
 class MazeKnowledgeBase:
     '''
     Specifies a simple, Conjunctive Normal Form Propositional
     Logic Knowledge Base for use in Grid Maze pathfinding problems
     with side-information.
+    
+    [!] MazeClauses are never mutated once constructed (their hash is cached
+    at construction), so clause sets can be copied shallowly and the same
+    clause objects shared between the KB and any working copies.
     '''
     
     def __init__ (self) -> None:
@@ -20,6 +27,14 @@ class MazeKnowledgeBase:
         It begins as an empty knowledgebase with no contained clauses.
         """
         self.clauses: set["MazeClause"] = set()
+        
+        # Answers to previous queries, only valid until the clauses next change
+        self._ask_cache: dict["MazeClause", bool] = dict()
+        
+        # Bit position interned for each prop this KB has resolved on, so its
+        # clauses can be packed into int bitmasks for saturate; kept per KB (and
+        # so freed along with it) since a mission's KB only ever sees that maze
+        self._prop_ids: dict[tuple[str, tuple[int, int]], int] = dict()
     
     def tell (self, clause: "MazeClause") -> None:
         """
@@ -33,7 +48,11 @@ class MazeKnowledgeBase:
             clause (MazeClause):
                 A new MazeClause to add to this knowledgebase
         """
+        #Valid clauses are true no matter what, so they'd only take up space
+        if clause.valid:
+            return
         self.clauses.add(clause)
+        self._ask_cache.clear()
         
     def ask (self, query: "MazeClause") -> bool:
         """
@@ -50,55 +69,160 @@ class MazeKnowledgeBase:
                 True if the KB entails the query, False otherwise
         """
         
+        if query in self._ask_cache:
+            return self._ask_cache[query]
+        
+        if query.valid:
+            #Valid queries hold no matter what the KB says
+            entailed = True
+        elif len(query) == 1:
+            ((prop, truth_val),) = query.props.items()
+            entailed = self.ask_unit(prop, truth_val)
+        else:
+            #~(a v ~b) is ~a ^ b, so each prop is negated into its own unit clause
+            negated = [MazeClause._from_sets(_NO_PROPS, frozenset((prop,))) for prop in query._pos] + \
+                      [MazeClause._from_sets(frozenset((prop,)), _NO_PROPS) for prop in query._neg]
+            entailed = self._refutes(negated)
+        
+        self._ask_cache[query] = entailed
+        return entailed
+    
+    def ask_unit (self, prop: tuple[str, tuple[int, int]], truth_val: bool) -> bool:
+        """
+        Returns True if the KB entails the single literal given, False otherwise;
+        the only kind of query the agent ever makes. Its negation is a single unit
+        clause, so unit propagation alone usually settles the question, with
+        resolution only needed on whatever clauses propagation leaves behind.
+        
+        Parameters:
+            prop (tuple[str, tuple[int, int]]):
+                The proposition being queried, like ("P", (1, 1))
+            truth_val (bool):
+                The truth value the KB is asked to entail for prop
+        
+        Returns:
+            bool:
+                True if the KB entails the literal, False otherwise
+        """
+        single = frozenset((prop,))
+        negated = MazeClause._from_sets(_NO_PROPS, single) if truth_val else MazeClause._from_sets(single, _NO_PROPS)
+        return self._refutes([negated])
+    
+    def _refutes (self, assumptions: list["MazeClause"]) -> bool:
+        """
+        Uncached core of ask, determining whether the KB's clauses along with the
+        given assumptions are contradictory: unit propagation is run first, then
+        resolution on whatever is left until either the empty clause is derived
+        or no new clauses can be.
+        
+        Parameters:
+            assumptions (list[MazeClause]):
+                The clauses (the negated query) assumed alongside the KB
+        
+        Returns:
+            bool:
+                True if a contradiction is derived, False otherwise
+        """
         #Create clone of self.clauses because you need a clone to freely make changes to
-        clauses = deepcopy(self.clauses)
+        clauses = self.clauses.copy()
+        clauses.update(assumptions)
         
-        #Add oppsite of MazeClause
-        inverseQuerySetInput = set()
-        for prop in query.props.keys():
-            inverseQuerySetInput.add((prop, not query.get_prop(prop)))
-            
-        clauses.add(MazeClause(inverseQuerySetInput))
+        #Unit clauses are cheap to apply directly, so settle them before resolving
+        remaining = MazeKnowledgeBase._propagate_units(clauses)
+        if remaining is None:
+            return True
         
+        return saturate(self._masks(clause) for clause in remaining)
+    
+    def _masks (self, clause: "MazeClause") -> tuple[int, int]:
+        """
+        Packs the given clause into a pair of bitmasks, with bit i of each set
+        when the clause holds the prop this KB interned as i un-negated / negated
+        (interning any props it hasn't seen before).
+        
+        Parameters:
+            clause (MazeClause):
+                The non-valid clause being packed
+        
+        Returns:
+            tuple[int, int]:
+                The clause's (pos_mask, neg_mask)
+        """
+        propIds = self._prop_ids
+        masks = [0, 0]
+        for (prop, truthVal) in clause.props.items():
+            propId = propIds.get(prop)
+            if propId is None:
+                propId = propIds[prop] = len(propIds)
+            masks[not truthVal] |= 1 << propId
+        return (masks[0], masks[1])
+    
+    @staticmethod
+    def _propagate_units (clauses: set["MazeClause"]) -> Optional[set["MazeClause"]]:
+        """
+        Runs unit propagation over the given clauses: each single-prop clause
+        fixes its prop's truth value, so clauses agreeing with it are dropped
+        and the opposing literal is removed from the rest (which may in turn
+        produce new unit clauses). The clauses left over never mention a fixed
+        prop, so they are satisfiable exactly when the input clauses are.
         
-        new = set()
+        Parameters:
+            clauses (set[MazeClause]):
+                The clauses to propagate through, which are updated in place
+                (so callers should pass a working copy)
         
-        # print("\nCase: \n")
+        Returns:
+            Optional[set[MazeClause]]:
+                The same (now reduced) set of clauses, or None if propagation
+                reached a contradiction
+        """
+        live = clauses
+        occurrences: dict[tuple, set["MazeClause"]] = dict()
+        units: deque["MazeClause"] = deque()
+        for clause in live:
+            if clause.is_empty():
+                return None
+            if len(clause) == 1:
+                units.append(clause)
+            for prop in clause.props:
+                if prop in occurrences:
+                    occurrences[prop].add(clause)
+                else:
+                    occurrences[prop] = {clause}
         
-        while True:
-            for c1, c2 in itertools.combinations(clauses, 2):
-                # print("\n  c1: " + c1.__str__())
-                # print("  c2: " + c2.__str__())
-
-                resolvants = MazeClause.resolve(c1, c2)
-                
-                # print("\n    resolvants: ", end="")
-                # if len(resolvants) == 0:
-                #     # print("    empty")
-                # else:
-                #     for mazeClause in resolvants:
-                #         # print("    " + str(mazeClause.props) + ",", end="")
-                
-                if MazeClause([]) in resolvants:
-                    # print("\n    MazeClause is empty" + "    ")
-                    return True
-                
-                new = new.union(resolvants)
-                
-                # print("\n    Union: ", end="")
-                # if len(new) == 0:
-                #     print("    empty")
-                # else:
-                #     for mazeClause in new:
-                #         print("    " + str(mazeClause.props) + ",", end="")
-                # print()
-                        
-            if new.issubset(clauses):
-                # print("    new is subset" + "    ")
-                return False
+        assigned: dict[tuple, bool] = dict()
+        while units:
+            unit = units.popleft()
+            if unit not in live:
+                continue
+            ((prop, truth_val),) = unit.props.items()
+            if prop in assigned:
+                if assigned[prop] != truth_val:
+                    return None
+                continue
+            assigned[prop] = truth_val
             
-            clauses = clauses.union(new)
-
+            for clause in occurrences.pop(prop, ()):
+                live.discard(clause)
+                for other in clause.props:
+                    if other != prop:
+                        occurrences[other].discard(clause)
+                if clause.props[prop] == truth_val:
+                    continue
+                
+                shrunk = clause.without_literal(prop)
+                if shrunk.is_empty():
+                    return None
+                if shrunk in live:
+                    continue
+                live.add(shrunk)
+                for other in shrunk.props:
+                    occurrences[other].add(shrunk)
+                if len(shrunk) == 1:
+                    units.append(shrunk)
+        
+        return live
+    
     def __len__ (self) -> int:
         """
         Returns the number of clauses currently stored in the KB
@@ -147,6 +271,7 @@ class MazeKnowledgeBase:
                 The known locations of safe tiles (i.e., not containing pits) in the maze
         """
         self.clauses = MazeKnowledgeBase.simplify_from_known_locs(self.clauses, known_pits, known_safe)
+        self._ask_cache.clear()
     
     @staticmethod
     def simplify_from_known_locs (clauses: set["MazeClause"], known_pits: set[tuple[int, int]], known_safe: set[tuple[int, int]]) -> set["MazeClause"]:
@@ -168,9 +293,28 @@ class MazeKnowledgeBase:
         Returns:
             A simplified set of the input clauses that may be less numerous and complex as the original
         """
-        for loc in known_pits | known_safe:
-            clauses = MazeKnowledgeBase.get_simplified_clauses(clauses, loc, loc in known_pits)
-        return clauses
+        known_map = {("P", loc): True for loc in known_pits}
+        known_map.update({("P", loc): False for loc in known_safe})
+        known_props = known_map.keys()
+        
+        simplified = set()
+        for clause in clauses:
+            if clause.valid:
+                continue
+            hit = clause._keys & known_props
+            if not hit:
+                simplified.add(clause)
+                continue
+            
+            # Clauses a known fact satisfies are redundant next to it (except for
+            # the unit clause stating that fact), and the rest drop every literal
+            # the known facts falsify all at once
+            if any(clause.props[prop] == known_map[prop] for prop in hit):
+                if len(clause) == 1:
+                    simplified.add(clause)
+                continue
+            simplified.add(MazeClause._from_sets(clause._pos - hit, clause._neg - hit))
+        return simplified
     
     @staticmethod
     def get_simplified_clauses (clauses: set["MazeClause"], loc: tuple[int, int], is_pit: bool) -> set["MazeClause"]:
@@ -192,17 +336,4 @@ class MazeKnowledgeBase:
         Returns:
             A simplified set of the input clauses that may be less numerous and complex as the original
         """
-        to_add = set()
-        to_rem = set()
-        sani_clause = MazeClause([(("P", loc), is_pit)])
-        for clause in clauses:
-            if len(clause) == 1:
-                continue
-            if clause.get_prop(("P", loc)) == is_pit:
-                to_rem.add(clause)
-                break
-            to_add.update(MazeClause.resolve(clause, sani_clause))
-            
-        clauses = clauses | to_add
-        clauses = clauses - to_rem
-        return clauses
\ No newline at end of file
+        return MazeKnowledgeBase.simplify_from_known_locs(clauses, {loc} if is_pit else set(), set() if is_pit else {loc})
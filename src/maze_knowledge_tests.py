@@ -1,6 +1,7 @@
-from environment import *
-from maze_clause import *
-from maze_knowledge_base import *
+from environment import Environment
+from maze_clause import MazeClause
+from maze_knowledge_base import MazeKnowledgeBase
+import itertools
 from copy import deepcopy
 import unittest
 
@@ -87,6 +88,72 @@ class MazeKnowledgeTests(unittest.TestCase):
         kb.tell(MazeClause([(("X", (0, 0)), False)]))
         self.assertTrue(kb.ask(MazeClause([(("Y", (0, 0)), True)])))
 
+    def test_mazekb7(self) -> None:
+        kb = MazeKnowledgeBase()
+        kb.tell(MazeClause([(("X", (1, 1)), True), (("Y", (1, 1)), True)]))
+        self.assertFalse(kb.ask(MazeClause([(("Y", (1, 1)), True)])))
+        
+        # A cached answer must not outlive a change to the KB
+        kb.tell(MazeClause([(("X", (1, 1)), False)]))
+        self.assertTrue(kb.ask(MazeClause([(("Y", (1, 1)), True)])))
+
+    def test_mazekb8(self) -> None:
+        kb = MazeKnowledgeBase()
+        kb.tell(MazeClause([(("P", (1, 1)), True), (("P", (2, 1)), False)]))
+        kb.tell(MazeClause([(("P", (1, 1)), False), (("P", (1, 2)), True)]))
+        kb.tell(MazeClause([(("P", (1, 1)), False), (("P", (3, 1)), True)]))
+        kb.tell(MazeClause([(("P", (1, 1)), True)]))
+        kb.simplify_self({(1, 1)}, set())
+        self.assertEqual({
+            MazeClause([(("P", (1, 1)), True)]),
+            MazeClause([(("P", (1, 2)), True)]),
+            MazeClause([(("P", (3, 1)), True)])
+        }, kb.clauses)
+
+    def test_mazekb9(self) -> None:
+        kb = MazeKnowledgeBase()
+        kb.tell(MazeClause([(("X", (1, 1)), True), (("Y", (1, 1)), True)]))
+        kb.tell(MazeClause([(("X", (1, 1)), False), (("Z", (1, 1)), True)]))
+        self.assertTrue(kb.ask(MazeClause([(("Y", (1, 1)), True), (("Z", (1, 1)), True)])))
+        self.assertFalse(kb.ask(MazeClause([(("X", (1, 1)), True), (("Z", (1, 1)), False)])))
+
+    def test_mazekb10(self) -> None:
+        kb = MazeKnowledgeBase()
+        kb.tell(MazeClause([(("X", (1, 1)), True), (("Y", (1, 1)), True)]))
+        kb.tell(MazeClause([(("X", (1, 1)), True), (("Y", (1, 1)), False)]))
+        kb.tell(MazeClause([(("X", (1, 1)), False), (("Z", (1, 1)), True)]))
+        self.assertTrue(kb.ask_unit(("X", (1, 1)), True))
+        self.assertTrue(kb.ask_unit(("Z", (1, 1)), True))
+        self.assertFalse(kb.ask_unit(("Y", (1, 1)), True))
+        self.assertFalse(kb.ask_unit(("Y", (1, 1)), False))
+
+    def test_mazekb11(self) -> None:
+        # Unit propagation alone can't settle these, so the answers come from resolution
+        kb = MazeKnowledgeBase()
+        kb.tell(MazeClause([(("X", (1, 1)), True), (("Y", (1, 1)), True)]))
+        kb.tell(MazeClause([(("X", (1, 1)), True), (("Y", (1, 1)), False)]))
+        kb.tell(MazeClause([(("X", (1, 1)), False), (("Y", (1, 1)), True), (("W", (1, 1)), True)]))
+        kb.tell(MazeClause([(("X", (1, 1)), False), (("Y", (1, 1)), False), (("W", (1, 1)), True)]))
+        self.assertTrue(kb.ask(MazeClause([(("W", (1, 1)), True)])))
+        self.assertFalse(kb.ask(MazeClause([(("W", (1, 1)), False)])))
+
+    def test_mazekb12(self) -> None:
+        kb = MazeKnowledgeBase()
+        kb.tell(MazeClause([(("X", (1, 1)), True), (("X", (1, 1)), False)]))
+        kb.tell(MazeClause([(("Y", (1, 1)), True), (("Y", (1, 1)), False), (("Z", (1, 1)), True)]))
+        self.assertEqual(0, len(kb))
+        self.assertFalse(kb.ask(MazeClause([(("Z", (1, 1)), True)])))
+
+    def test_mazekb13(self) -> None:
+        # Every sign combination of X, Y, Z or'd with W: with ~W assumed, no unit
+        # clauses appear and it takes three rounds of resolution (pairs, then
+        # units, then the empty clause) to show that W is entailed
+        kb = MazeKnowledgeBase()
+        for signs in itertools.product([True, False], repeat = 3):
+            kb.tell(MazeClause([(("X", (1, 1)), signs[0]), (("Y", (1, 1)), signs[1]), (("Z", (1, 1)), signs[2]), (("W", (1, 1)), True)]))
+        self.assertTrue(kb.ask(MazeClause([(("W", (1, 1)), True)])))
+        self.assertFalse(kb.ask(MazeClause([(("X", (1, 1)), True)])))
+
     # MazeInference Tests
     # -----------------------------------------------------------------------------------------
 
@@ -0,0 +1,165 @@
+'''
+Resolution saturation over clauses packed as (pos_mask, neg_mask) int pairs,
+where bit i of pos_mask / neg_mask is set when the clause contains the
+proposition interned as i un-negated / negated (see MazeKnowledgeBase._masks).
+Working on the bitmasks directly means no MazeClause is built for any of the
+intermediate resolvents.
+'''
+
+from typing import *
+
+# Bucket of literals no indexed clause contains
+_NO_CLAUSES: frozenset[tuple[int, int]] = frozenset()
+
+def _bits (mask: int) -> Iterator[int]:
+    """
+    Yields each set bit of the given mask as its own single-bit int.
+
+    Parameters:
+        mask (int):
+            The bitmask being split up
+
+    Returns:
+        Iterator[int]:
+            The set bits of mask, lowest first
+    """
+    while mask:
+        low = mask & -mask
+        yield low
+        mask ^= low
+
+def _index (clause: tuple[int, int], pos_idx: dict[int, set], neg_idx: dict[int, set]) -> None:
+    """
+    Adds the given clause to the literal indices under each of its bits.
+
+    Parameters:
+        clause (tuple[int, int]):
+            The (pos_mask, neg_mask) clause being indexed
+        pos_idx, neg_idx (dict[int, set[tuple[int, int]]]):
+            Maps from each single-bit prop to the clauses containing it un-negated / negated
+    """
+    for bit in _bits(clause[0]):
+        pos_idx.setdefault(bit, set()).add(clause)
+    for bit in _bits(clause[1]):
+        neg_idx.setdefault(bit, set()).add(clause)
+
+def _unindex (clause: tuple[int, int], pos_idx: dict[int, set], neg_idx: dict[int, set]) -> None:
+    """
+    Removes the given clause from the literal indices.
+
+    Parameters:
+        clause (tuple[int, int]):
+            The (pos_mask, neg_mask) clause being removed
+        pos_idx, neg_idx (dict[int, set[tuple[int, int]]]):
+            Maps from each single-bit prop to the clauses containing it un-negated / negated
+    """
+    for bit in _bits(clause[0]):
+        pos_idx[bit].discard(clause)
+    for bit in _bits(clause[1]):
+        neg_idx[bit].discard(clause)
+
+def _buckets (clause: tuple[int, int], pos_idx: dict[int, set], neg_idx: dict[int, set]) -> list[AbstractSet[tuple[int, int]]]:
+    """
+    Returns the index buckets of every literal in the given clause.
+
+    Parameters:
+        clause (tuple[int, int]):
+            The (pos_mask, neg_mask) clause whose literals are looked up
+        pos_idx, neg_idx (dict[int, set[tuple[int, int]]]):
+            Maps from each single-bit prop to the clauses containing it un-negated / negated
+
+    Returns:
+        list[AbstractSet[tuple[int, int]]]:
+            One bucket (possibly empty) per literal of the clause
+    """
+    return [pos_idx.get(bit, _NO_CLAUSES) for bit in _bits(clause[0])] + \
+           [neg_idx.get(bit, _NO_CLAUSES) for bit in _bits(clause[1])]
+
+def _resolve_pass (frontier: set[tuple[int, int]], pos_idx: dict[int, set], neg_idx: dict[int, set]) -> Optional[set[tuple[int, int]]]:
+    """
+    Resolves every frontier clause against the indexed clauses it can resolve with.
+
+    Parameters:
+        frontier (set[tuple[int, int]]):
+            The clauses added by the previous pass
+        pos_idx, neg_idx (dict[int, set[tuple[int, int]]]):
+            Maps from each single-bit prop to the kept clauses containing it un-negated / negated
+
+    Returns:
+        Optional[set[tuple[int, int]]]:
+            The resolvents derived, or None if one of them is the empty clause
+    """
+    new = set()
+    for (pos1, neg1) in frontier:
+        # Only clauses holding one of this clause's props with the opposite
+        # sign can resolve with it, so clauses sharing no props are never
+        # even looked at; a clause sharing several such props shows up in
+        # several buckets but only needs checking once
+        partners = set().union(*[neg_idx.get(bit, ()) for bit in _bits(pos1)],
+                               *[pos_idx.get(bit, ()) for bit in _bits(neg1)])
+        for (pos2, neg2) in partners:
+            # Resolving on two or more complements only ever yields valid clauses
+            complements = (pos1 & neg2) | (neg1 & pos2)
+            if complements & (complements - 1):
+                continue
+            resolvent = ((pos1 | pos2) & ~complements, (neg1 | neg2) & ~complements)
+            if resolvent == (0, 0):
+                return None
+            new.add(resolvent)
+    return new
+
+def saturate (clauses: Iterable[tuple[int, int]]) -> bool:
+    """
+    Repeatedly resolves the given clauses until either the empty clause is
+    derived or no new clauses can be. Each pass only resolves the clauses
+    added by the previous pass against everything kept, and resolvents
+    subsumed by a kept clause are discarded (while kept clauses subsumed by
+    a resolvent are dropped in its favour).
+
+    Parameters:
+        clauses (Iterable[tuple[int, int]]):
+            The non-valid (pos_mask, neg_mask) clauses to saturate
+
+    Returns:
+        bool:
+            True if the clauses are unsatisfiable (the empty clause was
+            derived), False otherwise
+    """
+    kept: set[tuple[int, int]] = set(clauses)
+    if (0, 0) in kept:
+        return True
+
+    pos_idx: dict[int, set] = dict()
+    neg_idx: dict[int, set] = dict()
+    for clause in kept:
+        _index(clause, pos_idx, neg_idx)
+
+    frontier = set(kept)
+    while frontier:
+        new = _resolve_pass(frontier, pos_idx, neg_idx)
+        if new is None:
+            return True
+
+        # Shorter resolvents go first so they get to do the most pruning
+        frontier = set()
+        for clause in sorted(new, key = lambda c: c[0].bit_count() + c[1].bit_count()):
+            (pos, neg) = clause
+            if clause in kept:
+                continue
+
+            # Any kept clause subsuming this one shares at least one of its literals
+            buckets = _buckets(clause, pos_idx, neg_idx)
+            if any(k[0] & ~pos == 0 and k[1] & ~neg == 0 for bucket in buckets for k in bucket):
+                continue
+
+            # Any kept clause this one subsumes holds all of its literals
+            for subsumed in [k for k in min(buckets, key = len) if pos & ~k[0] == 0 and neg & ~k[1] == 0]:
+                kept.remove(subsumed)
+                frontier.discard(subsumed)
+                _unindex(subsumed, pos_idx, neg_idx)
+
+            kept.add(clause)
+            frontier.add(clause)
+            _index(clause, pos_idx, neg_idx)
+
+    return False
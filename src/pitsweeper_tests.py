@@ -1,202 +1,210 @@
-from environment import *
-from maze_clause import *
-from constants import *
-from maze_knowledge_base import *
-from copy import deepcopy
-from statistics import *
-import unittest
+from environment import Environment
+import json
+import os
 import pytest
+from typing import *
 
-# Time in seconds given to complete mazes of different difficulty
-# Can temporarily set these high for debugging
-EASY_TIMEOUT = 10
-MED_TIMEOUT  = 40
-HARD_TIMEOUT = 60
 OPT_ERR = "[X] Your agent's score was too low to pass this test"
 
-# Set VERBOSE to True and TICK to something like 1 to see maze 
-# played out, then run individual tests using the syntax like:
-# pytest -k test_pitsweeper_easy1
-VERBOSE = False
-TICK    = 0
+# Set PITSWEEPER_VERBOSE=1 and PITSWEEPER_TICK to something like 1 to see
+# maze played out, then run individual tests using the syntax like:
+# PITSWEEPER_VERBOSE=1 PITSWEEPER_TICK=1 pytest -k easy1
+# With pytest-xdist installed, the mazes can instead be spread across
+# every core with: pytest -n auto pitsweeper_tests.py
+VERBOSE = os.getenv("PITSWEEPER_VERBOSE") == "1"
+TICK    = float(os.getenv("PITSWEEPER_TICK", "0"))
 
-# Logs for grade reporting
-easy_scores: dict[str, int] = dict()
-med_scores: dict[str, int]  = dict()
-hard_scores: dict[str, int] = dict()
-custom_scores: dict[str, int] = dict()
-
-class PitsweeperTests(unittest.TestCase):
+def score_maze (score_dir: str, test_name: str, threshold: int, score: int, bucket: str) -> None:
     """
-    The final set of tests for your MazeAgent and Pitsweeping!
-    
-    [!] Ensure that all MazeClause and MazeKnowledgeBase tests pass before
-    moving onto this one!
+    Logs the scores of your agent on each of the different test difficulties,
+    and ensure that, individually, each passes the threshold minimum score.
+    The averages are reported once all tests finish (see conftest.py).
     
-    [!] Warning: the following is only a partial set of the grading unit
-    tests! Make sure you test your agent adequately to give yourself the
-    confidence that it behaves correctly!
+    Parameters:
+        score_dir (str):
+            The directory this session's score shards are written to.
+        test_name (str):
+            The name of the test the score was obtained in.
+        threshold (int):
+            The minimum score that passes the given maze.
+        score (int):
+            The score obtained by your agent on the given maze.
+        bucket (str):
+            The difficulty the current score is averaged under, one of
+            "easy", "med", "hard" or "custom".
     """
-    
-    def score_maze (self, threshold: int, score: int, dict_log: dict) -> None:
-        """
-        Logs the scores of your agent on each of the different test difficulties,
-        and ensure that, individually, each passes the threshold minimum score.
-        
-        Parameters:
-            threshold (int):
-                The minimum score that passes the given maze.
-            score (int):
-                The score obtained by your agent on the given maze.
-            dict_log (dict):
-                The dictionary of scores in which to log the current one.
-        """
-        dict_log[self._testMethodName] = score
-        self.assertLess(threshold, score, OPT_ERR)
-    
-    @classmethod
-    def tearDownClass(cls: Any) -> None:
-        """
-        Simple reporting method that is called at the end of the unit tests to report
-        scores; used for grading only.
-        """
-        if len(easy_scores) == 0 or len(med_scores) == 0 or len(hard_scores) == 0 or len(custom_scores) == 0:
-            return
-        print("\n---------------------------------------------")
-        print("[!] Tests completed:")
-        print("    > Easy Test Average:\t" + str(mean(easy_scores.values())))
-        print("    > Medium Test Average:\t" + str(mean(med_scores.values())))
-        print("    > Hard Test Average:\t" + str(mean(hard_scores.values())))
-        print("    > Custom Test Average:\t" + str(mean(custom_scores.values())))
-    
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    with open(os.path.join(score_dir, worker + ".jsonl"), "a") as f:
+        f.write(json.dumps({"test": test_name, "bucket": bucket, "score": score}) + "\n")
+    assert score > threshold, OPT_ERR
+
+# Used on its own by the Environment tests below as well as by test_pitsweeper
+#                    c-> 012345   # r
+EASY2_MAZE: list[str] = ["XXXXXX", # 0
+                         "X...GX", # 1
+                         "X...PX", # 2
+                         "X....X", # 3
+                         "X..P.X", # 4
+                         "X@...X", # 5
+                         "XXXXXX"] # 6
+
+# Each case is (maze, threshold, bucket): the agent's score on the maze must be
+# strictly greater than threshold, and is averaged with the others in bucket.
+# The easy / med / hard marks set each maze's timeout (see conftest.py).
+# The custom mazes are marked slow so quick runs can skip them with -m "not slow"
+MAZES = [
     # EZ Tests
     # -----------------------------------------------------------------------------------------
     
-    @pytest.mark.timeout(EASY_TIMEOUT)
-    def test_pitsweeper_easy1(self) -> None:
-        #    c-> 012345   # r
-        maze = ["XXXXXX", # 0
-                "X...GX", # 1
-                "X...PX", # 2
-                "X....X", # 3
-                "X....X", # 4
-                "X@...X", # 5
-                "XXXXXX"] # 6
-        env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
-        score = env.start_mission()
-        # assertLess(threshold, score) where score must be > threshold to pass
-        self.score_maze(-20, score, easy_scores)
-        
-    @pytest.mark.timeout(EASY_TIMEOUT)
-    def test_pitsweeper_easy2(self) -> None:
+    pytest.param(
         #    c-> 012345   # r
-        maze = ["XXXXXX", # 0
-                "X...GX", # 1
-                "X...PX", # 2
-                "X....X", # 3
-                "X..P.X", # 4
-                "X@...X", # 5
-                "XXXXXX"] # 6
-        env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
-        score = env.start_mission()
-        self.score_maze(-20, score, easy_scores)
+        ("XXXXXX", # 0
+         "X...GX", # 1
+         "X...PX", # 2
+         "X....X", # 3
+         "X....X", # 4
+         "X@...X", # 5
+         "XXXXXX"),# 6
+        -20, "easy", id = "easy1", marks = pytest.mark.easy),
+    pytest.param(EASY2_MAZE, -20, "easy", id = "easy2", marks = pytest.mark.easy),
     
     # Medium Tests
     # -----------------------------------------------------------------------------------------
     
-    @pytest.mark.timeout(MED_TIMEOUT)
-    def test_pitsweeper_med1(self) -> None:
-        maze = ["XXXXXXXXX",
-                "X..PGP..X",
-                "X.......X",
-                "X..PPP..X",
-                "X.......X",
-                "X..@....X",
-                "XXXXXXXXX"]
-        env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
-        score = env.start_mission()
-        self.score_maze(-32, score, med_scores)
-        
-    @pytest.mark.timeout(MED_TIMEOUT)
-    def test_pitsweeper_med2(self) -> None:
-        maze = ["XXXXXXXXX",
-                "X..P.P.GX",
-                "X@......X",
-                "X..P.P..X",
-                "X.......X",
-                "X.......X",
-                "XXXXXXXXX"]
-        env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
-        score = env.start_mission()
-        self.score_maze(-32, score, med_scores)
-        
+    pytest.param(
+        ("XXXXXXXXX",
+         "X..PGP..X",
+         "X.......X",
+         "X..PPP..X",
+         "X.......X",
+         "X..@....X",
+         "XXXXXXXXX"),
+        -32, "med", id = "med1", marks = pytest.mark.med),
+    pytest.param(
+        ("XXXXXXXXX",
+         "X..P.P.GX",
+         "X@......X",
+         "X..P.P..X",
+         "X.......X",
+         "X.......X",
+         "XXXXXXXXX"),
+        -32, "med", id = "med2", marks = pytest.mark.med),
+    
     # Hard Tests
     # -----------------------------------------------------------------------------------------
     
-    @pytest.mark.timeout(HARD_TIMEOUT)
-    def test_pitsweeper_hard1(self) -> None:
-        maze = ["XXXXXXXXX",
-                "X......GX",
-                "X.......X",
-                "X.PPPPPPX",
-                "X.......X",
-                "X......@X",
-                "XXXXXXXXX"]
-        env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
-        score = env.start_mission()
-        self.score_maze(-35, score, hard_scores)
-        
-    @pytest.mark.timeout(HARD_TIMEOUT)
-    def test_pitsweeper_hard2(self) -> None:
-        maze = ["XXXXXXXXX",
-                "XG.P....X",
-                "X.......X",
-                "X.PP.PP.X",
-                "XP.....PX",
-                "X...@...X",
-                "XXXXXXXXX"]
-        env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
-        score = env.start_mission()
-        self.score_maze(-40, score, hard_scores)
-        
-    @pytest.mark.timeout(HARD_TIMEOUT)
-    def test_pitsweeper_custom1(self) -> None:
-        maze = ["XXXXXXXXX",
-                "XG.P..PPX",
-                "XP....PPX",
-                "X.PP..P.X",
-                "XPPP..PPX",
-                "XPP.@.PPX",
-                "XXXXXXXXX"]
-        env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
-        score = env.start_mission()
-        self.score_maze(-40, score, custom_scores)
-        
-    @pytest.mark.timeout(HARD_TIMEOUT)
-    def test_pitsweeper_custom2(self) -> None:
-        maze = ["XXXXXXXXX",
-                "XG.PPPPPX",
-                "X.......X",
-                "X.PP..P.X",
-                "XP.....PX",
-                "XPP.@.PPX",
-                "XXXXXXXXX"]
-        env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
-        score = env.start_mission()
-        self.score_maze(-40, score, custom_scores)
+    pytest.param(
+        ("XXXXXXXXX",
+         "X......GX",
+         "X.......X",
+         "X.PPPPPPX",
+         "X.......X",
+         "X......@X",
+         "XXXXXXXXX"),
+        -35, "hard", id = "hard1", marks = pytest.mark.hard),
+    pytest.param(
+        ("XXXXXXXXX",
+         "XG.P....X",
+         "X.......X",
+         "X.PP.PP.X",
+         "XP.....PX",
+         "X...@...X",
+         "XXXXXXXXX"),
+        -40, "hard", id = "hard2", marks = pytest.mark.hard),
+    pytest.param(
+        ("XXXXXXXXX",
+         "XG.P..PPX",
+         "XP....PPX",
+         "X.PP..P.X",
+         "XPPP..PPX",
+         "XPP.@.PPX",
+         "XXXXXXXXX"),
+        -40, "custom", id = "custom1", marks = [pytest.mark.hard, pytest.mark.slow]),
+    pytest.param(
+        ("XXXXXXXXX",
+         "XG.PPPPPX",
+         "X.......X",
+         "X.PP..P.X",
+         "XP.....PX",
+         "XPP.@.PPX",
+         "XXXXXXXXX"),
+        -40, "custom", id = "custom2", marks = [pytest.mark.hard, pytest.mark.slow]),
+    pytest.param(
+        ("XXXXXXXXX",
+         "XGP.PPPPX",
+         "X......PX",
+         "XPPP..P.X",
+         "XP.P..P.X",
+         "XPP.@.PPX",
+         "XXXXXXXXX"),
+        -40, "custom", id = "custom3", marks = [pytest.mark.hard, pytest.mark.slow]),
+]
+
+@pytest.mark.parametrize("maze,threshold,bucket", MAZES)
+def test_pitsweeper (request: pytest.FixtureRequest, score_dir: str, maze: Sequence[str], threshold: int, bucket: str) -> None:
+    """
+    The final set of tests for your MazeAgent and Pitsweeping!
+    
+    [!] Ensure that all MazeClause and MazeKnowledgeBase tests pass before
+    moving onto this one!
+    
+    [!] Warning: the following is only a partial set of the grading unit
+    tests! Make sure you test your agent adequately to give yourself the
+    confidence that it behaves correctly!
+    """
+    env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
+    score = env.start_mission()
+    score_maze(score_dir, request.node.name, threshold, score, bucket)
+
+def test_initial_safety_inferences () -> None:
+    """
+    Checks what the agent can conclude about tile safety from its starting
+    perception alone, before it has made any move.
+    """
+    #    c-> 012345   # r
+    maze = ("XXXXXX", # 0
+            "X...GX", # 1
+            "X..PPX", # 2
+            "X....X", # 3
+            "X..P.X", # 4
+            "X@...X", # 5
+            "XXXXXX") # 6
+    env = Environment(maze, tick_length = 0, verbose = False)
+    # The starting tile should be known as safe
+    assert env.test_safety_check((1, 5)) is True
+    
+    # Given that the perception will be a 0 tile on the initial space, we also
+    # know that surrounding tiles are
+    assert env.test_safety_check((1, 4)) is True
+    assert env.test_safety_check((2, 5)) is True
     
-    @pytest.mark.timeout(HARD_TIMEOUT)
-    def test_pitsweeper_custom3(self) -> None:
-        maze = ["XXXXXXXXX",
-                "XGP.PPPPX",
-                "X......PX",
-                "XPPP..P.X",
-                "XP.P..P.X",
-                "XPP.@.PPX",
-                "XXXXXXXXX"]
-        env = Environment(maze, tick_length = TICK, verbose = VERBOSE)
-        score = env.start_mission()
-        self.score_maze(-40, score, custom_scores)
+    # If that's the only perception, however, other tiles won't be known safe
+    assert env.test_safety_check((2, 4)) is None
+    assert env.test_safety_check((4, 2)) is None
+    
+    # Still, the goal should always be safe
+    assert env.test_safety_check((4, 1)) is True
+
+def test_repeated_maze_is_independent () -> None:
+    """
+    Environments built from the same maze share its cached parse, so playing one
+    out must leave nothing behind that changes how the next one plays.
+    """
+    maze = EASY2_MAZE
+    first = Environment(maze, tick_length = 0, verbose = False)
+    second = Environment(maze, tick_length = 0, verbose = False)
+    assert first.start_mission() == second.start_mission()
+    assert Environment(maze, tick_length = 0, verbose = False).get_playable_locs() == first.get_playable_locs()
+
+
+def test_non_ascii_tiles_are_playable () -> None:
+    """
+    Characters without a meaning in the maze (including non-ASCII ones) are
+    plain playable tiles, just as "." is.
+    """
+    maze = EASY2_MAZE
+    env = Environment(tuple(row.replace(".", "é") for row in maze), tick_length = 0, verbose = False)
+    assert env.get_playable_locs() == Environment(maze, tick_length = 0, verbose = False).get_playable_locs()
         
 if __name__ == "__main__":
-    unittest.main()
+    pytest.main([__file__])